@@ -37,10 +37,13 @@ def prepare_user_search_document_value(
                 [user],
                 "addresses",
             )
-        for address in user.addresses.all():
-            search_document += generate_address_search_document_value(address)
+        search_document += "".join(
+            generate_address_search_document_value(address)
+            for address in user.addresses.all()
+        )
 
-    return search_document.lower()
+    # both helpers already return lowercased values
+    return search_document
 
 
 def generate_user_fields_search_document_value(user: "User"):
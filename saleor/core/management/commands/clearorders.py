@@ -126,14 +126,17 @@ class Command(BaseCommand):
         gift_card_events = GiftCardEvent.objects.all()
         gift_card_events._raw_delete(gift_card_events.db)
 
+        gift_card_tag_relations = GiftCard.tags.through.objects.all()
+        gift_card_tag_relations._raw_delete(gift_card_tag_relations.db)
+
         gift_card_tags = GiftCardTag.objects.all()
-        gift_card_tags.delete()
+        gift_card_tags._raw_delete(gift_card_tags.db)
 
         checkout_gift_cards = Checkout.gift_cards.through.objects.all()
-        checkout_gift_cards.delete()
+        checkout_gift_cards._raw_delete(checkout_gift_cards.db)
 
         order_gift_cards = Order.gift_cards.through.objects.all()
-        order_gift_cards.delete()
+        order_gift_cards._raw_delete(order_gift_cards.db)
 
         gift_cards = GiftCard.objects.all()
         gift_cards._raw_delete(gift_cards.db)
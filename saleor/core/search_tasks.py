@@ -100,9 +100,9 @@ def set_order_search_document_values(
             .order_by("pk")
         )
         with transaction.atomic():
-            _orders_lock = list(orders.select_for_update(of=(["self"])))
+            locked_orders = list(orders.select_for_update(of=(["self"])))
             updated_count += set_search_vector_values(
-                list(orders), prepare_order_search_vector_value
+                locked_orders, prepare_order_search_vector_value
             )
 
     task_logger.info("Updated %d orders", updated_count)
@@ -111,7 +111,7 @@ def set_order_search_document_values(
         task_logger.info("Setting order search document values finished.")
         return
 
-    del orders
+    del locked_orders
 
     set_order_search_document_values.delay(
         update_all, database_connection_name, updated_count, order_number=numbers[-1]
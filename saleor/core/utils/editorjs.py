@@ -6,7 +6,9 @@ from django.utils.html import strip_tags
 from urllib3.util import parse_url
 
 BLACKLISTED_URL_SCHEMES = ("javascript",)
-HYPERLINK_TAG_WITH_URL_PATTERN = r"(.*?<a\s+href=\\?\")(\w+://\S+[^\\])(\\?\">)"
+HYPERLINK_TAG_WITH_URL_PATTERN = re.compile(
+    r"(.*?<a\s+href=\\?\")(\w+://\S+[^\\])(\\?\">)"
+)
 
 ITEM_TYPE_TO_CLEAN_FUNC_MAP = {
     "list": lambda *params: clean_list_item(*params),
@@ -125,12 +127,13 @@ def clean_text_data_block(text: str) -> str:
     By default, only the protocol ``javascript`` is denied.
     """
 
-    if not text:
+    # cheap substring check to skip the regex scan for text without hyperlinks
+    if not text or "<a" not in text:
         return text
 
     end_of_match = 0
     new_text = ""
-    for match in re.finditer(HYPERLINK_TAG_WITH_URL_PATTERN, text):
+    for match in HYPERLINK_TAG_WITH_URL_PATTERN.finditer(text):
         original_url = match.group(2)
         original_url.strip()
 
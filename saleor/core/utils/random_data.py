@@ -14,7 +14,7 @@ from unittest.mock import patch
 import graphene
 from django.conf import settings
 from django.core.files import File
-from django.db import connection
+from django.db import connection, transaction
 from django.db.models import F
 from django.utils import timezone
 from django.utils.text import slugify
@@ -191,6 +191,26 @@ def get_sample_data():
     return types
 
 
+def bulk_update_or_create(model, objects_data: list[tuple[int, dict]]):
+    """Insert or update the given objects by primary key in a single query.
+
+    Behaves like calling `update_or_create(pk=pk, defaults=defaults)` for each
+    `(pk, defaults)` pair, without the per-object SELECT and INSERT/UPDATE.
+    Model `save()` methods and signals are not called.
+    """
+    if not objects_data:
+        return []
+    update_fields = list(
+        dict.fromkeys(field for _, defaults in objects_data for field in defaults)
+    )
+    return model.objects.bulk_create(
+        [model(pk=pk, **defaults) for pk, defaults in objects_data],
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=update_fields,
+    )
+
+
 def get_weight(weight):
     if not weight:
         return zero_weight()
@@ -199,11 +219,13 @@ def get_weight(weight):
 
 
 def create_product_types(product_type_data):
+    product_types_data = []
     for product_type in product_type_data:
         pk = product_type["pk"]
         defaults = product_type["fields"]
         defaults["weight"] = get_weight(defaults["weight"])
-        ProductType.objects.update_or_create(pk=pk, defaults=defaults)
+        product_types_data.append((pk, defaults))
+    bulk_update_or_create(ProductType, product_types_data)
 
 
 def create_categories(categories_data, placeholder_dir):
@@ -255,28 +277,40 @@ def assign_products_to_collections(associations: list):
 
 
 def create_attributes(attributes_data):
-    for attribute in attributes_data:
-        pk = attribute["pk"]
-        defaults = attribute["fields"]
-        attr, _ = Attribute.objects.update_or_create(pk=pk, defaults=defaults)
+    bulk_update_or_create(
+        Attribute,
+        [(attribute["pk"], attribute["fields"]) for attribute in attributes_data],
+    )
 
 
 def create_attributes_values(values_data):
+    attribute_values_data = []
     for value in values_data:
         pk = value["pk"]
         defaults = dict(value["fields"])
         defaults["attribute_id"] = defaults.pop("attribute")
-        AttributeValue.objects.update_or_create(pk=pk, defaults=defaults)
+        if "reference_page" in defaults:
+            defaults["reference_page_id"] = defaults.pop("reference_page")
+        attribute_values_data.append((pk, defaults))
+    bulk_update_or_create(AttributeValue, attribute_values_data)
 
 
 def assign_reference_page_types_to_attributes(relations: list):
-    for relation in relations:
-        fields = relation["fields"]
-        attribute = Attribute.objects.get(pk=fields["attribute"])
-        attribute.reference_page_types.add(fields["page_type"])
+    AttributeReferencePageType = Attribute.reference_page_types.through
+    AttributeReferencePageType.objects.bulk_create(
+        [
+            AttributeReferencePageType(
+                attribute_id=relation["fields"]["attribute"],
+                pagetype_id=relation["fields"]["page_type"],
+            )
+            for relation in relations
+        ],
+        ignore_conflicts=True,
+    )
 
 
 def create_products(products_data, placeholder_dir, create_images):
+    products_data_to_upsert = []
     for product in products_data:
         pk = product["pk"]
         # We are skipping products without images
@@ -289,38 +323,36 @@ def create_products(products_data, placeholder_dir, create_images):
         defaults["product_type_id"] = defaults.pop("product_type")
         if default_variant := defaults.pop("default_variant", None):
             defaults["default_variant_id"] = default_variant
+        products_data_to_upsert.append((pk, defaults))
 
-        product, _ = Product.objects.update_or_create(pk=pk, defaults=defaults)
+    products = bulk_update_or_create(Product, products_data_to_upsert)
 
-        if create_images:
-            images = IMAGES_MAPPING.get(pk, [])
-            for image_name in images:
+    if create_images:
+        for product in products:
+            images = IMAGES_MAPPING.get(product.pk, [])
+            # We don't want to create duplicated product images
+            missing_images_count = max(len(images) - product.media.count(), 0)
+            for image_name in images[:missing_images_count]:
                 create_product_image(product, placeholder_dir, image_name)
 
 
 def create_product_channel_listings(product_channel_listings_data):
     channel_USD = Channel.objects.get(slug=settings.DEFAULT_CHANNEL_SLUG)
     channel_PLN = Channel.objects.get(slug="channel-pln")
+    listings_data = []
     for product_channel_listing in product_channel_listings_data:
         pk = product_channel_listing["pk"]
         defaults = dict(product_channel_listing["fields"])
         defaults["product_id"] = defaults.pop("product")
         channel = defaults.pop("channel")
         defaults["channel_id"] = channel_USD.pk if channel == 1 else channel_PLN.pk
-        ProductChannelListing.objects.update_or_create(pk=pk, defaults=defaults)
-
-
-def create_stocks(variant, warehouse_qs=None, **defaults):
-    if warehouse_qs is None:
-        warehouse_qs = Warehouse.objects.all()
-
-    for warehouse in warehouse_qs:
-        Stock.objects.update_or_create(
-            warehouse=warehouse, product_variant=variant, defaults=defaults
-        )
+        listings_data.append((pk, defaults))
+    bulk_update_or_create(ProductChannelListing, listings_data)
 
 
 def create_product_variants(variants_data, create_images):
+    warehouses = list(Warehouse.objects.all())
+    stocks = []
     for variant in variants_data:
         pk = variant["pk"]
         defaults = dict(variant["fields"])
@@ -342,12 +374,22 @@ def create_product_variants(variants_data, create_images):
             image = variant.product.get_first_image()
             VariantMedia.objects.get_or_create(variant=variant, media=image)
         quantity = random.randint(100, 500)
-        create_stocks(variant, quantity=quantity)
+        stocks.extend(
+            Stock(warehouse=warehouse, product_variant=variant, quantity=quantity)
+            for warehouse in warehouses
+        )
+    Stock.objects.bulk_create(
+        stocks,
+        update_conflicts=True,
+        unique_fields=["warehouse", "product_variant"],
+        update_fields=["quantity"],
+    )
 
 
 def create_product_variant_channel_listings(product_variant_channel_listings_data):
     channel_USD = Channel.objects.get(slug=settings.DEFAULT_CHANNEL_SLUG)
     channel_PLN = Channel.objects.get(slug="channel-pln")
+    listings_data = []
     for variant_channel_listing in product_variant_channel_listings_data:
         pk = variant_channel_listing["pk"]
         defaults = dict(variant_channel_listing["fields"])
@@ -355,58 +397,69 @@ def create_product_variant_channel_listings(product_variant_channel_listings_dat
         defaults["variant_id"] = defaults.pop("variant")
         channel = defaults.pop("channel")
         defaults["channel_id"] = channel_USD.pk if channel == 1 else channel_PLN.pk
-        ProductVariantChannelListing.objects.update_or_create(pk=pk, defaults=defaults)
+        listings_data.append((pk, defaults))
+    bulk_update_or_create(ProductVariantChannelListing, listings_data)
 
 
 def assign_attributes_to_product_types(
     association_model: type[AttributeProduct] | type[AttributeVariant],
     attributes: list,
 ):
+    associations_data = []
     for value in attributes:
         pk = value["pk"]
         defaults = dict(value["fields"])
         defaults["attribute_id"] = defaults.pop("attribute")
         defaults["product_type_id"] = defaults.pop("product_type")
-        association_model.objects.update_or_create(pk=pk, defaults=defaults)
+        associations_data.append((pk, defaults))
+    bulk_update_or_create(association_model, associations_data)
 
 
 def assign_attributes_to_page_types(
     association_model: type[AttributePage],
     attributes: list,
 ):
+    associations_data = []
     for value in attributes:
         pk = value["pk"]
         defaults = dict(value["fields"])
         defaults["attribute_id"] = defaults.pop("attribute")
         defaults["page_type_id"] = defaults.pop("page_type")
-        association_model.objects.update_or_create(pk=pk, defaults=defaults)
+        associations_data.append((pk, defaults))
+    bulk_update_or_create(association_model, associations_data)
 
 
 def assign_attribute_values_to_products(values):
+    assigned_values_data = []
     for value in values:
         pk = value["pk"]
         defaults = dict(value["fields"])
         defaults["value_id"] = defaults.pop("value")
         defaults["product_id"] = defaults.pop("product")
-        AssignedProductAttributeValue.objects.update_or_create(pk=pk, defaults=defaults)
+        assigned_values_data.append((pk, defaults))
+    bulk_update_or_create(AssignedProductAttributeValue, assigned_values_data)
 
 
 def assign_attributes_to_variants(variant_attributes):
+    assigned_attributes_data = []
     for value in variant_attributes:
         pk = value["pk"]
         defaults = dict(value["fields"])
         defaults["variant_id"] = defaults.pop("variant")
         defaults["assignment_id"] = defaults.pop("assignment")
-        AssignedVariantAttribute.objects.update_or_create(pk=pk, defaults=defaults)
+        assigned_attributes_data.append((pk, defaults))
+    bulk_update_or_create(AssignedVariantAttribute, assigned_attributes_data)
 
 
 def assign_attribute_values_to_variants(variant_attribute_values):
+    assigned_values_data = []
     for value in variant_attribute_values:
         pk = value["pk"]
         defaults = dict(value["fields"])
         defaults["value_id"] = defaults.pop("value")
         defaults["assignment_id"] = defaults.pop("assignment")
-        AssignedVariantAttributeValue.objects.update_or_create(pk=pk, defaults=defaults)
+        assigned_values_data.append((pk, defaults))
+    bulk_update_or_create(AssignedVariantAttributeValue, assigned_values_data)
 
 
 def set_field_as_money(defaults, field):
@@ -418,57 +471,59 @@ def set_field_as_money(defaults, field):
 def create_products_by_schema(placeholder_dir, create_images):
     types = get_sample_data()
 
-    create_product_types(product_type_data=types["product.producttype"])
-    create_categories(
-        categories_data=types["product.category"], placeholder_dir=placeholder_dir
-    )
-    create_attributes(attributes_data=types["attribute.attribute"])
-    create_attributes_values(values_data=types["attribute.attributevalue"])
+    # Load the whole catalogue in one transaction instead of committing each row
+    with transaction.atomic():
+        create_product_types(product_type_data=types["product.producttype"])
+        create_categories(
+            categories_data=types["product.category"], placeholder_dir=placeholder_dir
+        )
+        create_attributes(attributes_data=types["attribute.attribute"])
+        create_attributes_values(values_data=types["attribute.attributevalue"])
 
-    create_products(
-        products_data=types["product.product"],
-        placeholder_dir=placeholder_dir,
-        create_images=create_images,
-    )
-    create_product_channel_listings(
-        product_channel_listings_data=types["product.productchannellisting"],
-    )
-    create_product_variants(
-        variants_data=types["product.productvariant"], create_images=create_images
-    )
-    create_product_variant_channel_listings(
-        product_variant_channel_listings_data=types[
-            "product.productvariantchannellisting"
-        ],
-    )
-    assign_attributes_to_product_types(
-        AttributeProduct, attributes=types["attribute.attributeproduct"]
-    )
-    assign_attributes_to_product_types(
-        AttributeVariant, attributes=types["attribute.attributevariant"]
-    )
-    assign_attributes_to_page_types(
-        AttributePage, attributes=types["attribute.attributepage"]
-    )
-    assign_attribute_values_to_products(
-        types["attribute.assignedproductattributevalue"]
-    )
-    assign_attributes_to_variants(
-        variant_attributes=types["attribute.assignedvariantattribute"]
-    )
-    assign_attribute_values_to_variants(
-        types["attribute.assignedvariantattributevalue"]
-    )
-    assign_reference_page_types_to_attributes(
-        types["attribute.attribute_reference_page_types"]
-    )
-    create_collections(
-        data=types["product.collection"], placeholder_dir=placeholder_dir
-    )
-    create_collection_channel_listings(
-        collection_channel_listings_data=types["product.collectionchannellisting"],
-    )
-    assign_products_to_collections(associations=types["product.collectionproduct"])
+        create_products(
+            products_data=types["product.product"],
+            placeholder_dir=placeholder_dir,
+            create_images=create_images,
+        )
+        create_product_channel_listings(
+            product_channel_listings_data=types["product.productchannellisting"],
+        )
+        create_product_variants(
+            variants_data=types["product.productvariant"], create_images=create_images
+        )
+        create_product_variant_channel_listings(
+            product_variant_channel_listings_data=types[
+                "product.productvariantchannellisting"
+            ],
+        )
+        assign_attributes_to_product_types(
+            AttributeProduct, attributes=types["attribute.attributeproduct"]
+        )
+        assign_attributes_to_product_types(
+            AttributeVariant, attributes=types["attribute.attributevariant"]
+        )
+        assign_attributes_to_page_types(
+            AttributePage, attributes=types["attribute.attributepage"]
+        )
+        assign_attribute_values_to_products(
+            types["attribute.assignedproductattributevalue"]
+        )
+        assign_attributes_to_variants(
+            variant_attributes=types["attribute.assignedvariantattribute"]
+        )
+        assign_attribute_values_to_variants(
+            types["attribute.assignedvariantattributevalue"]
+        )
+        assign_reference_page_types_to_attributes(
+            types["attribute.attribute_reference_page_types"]
+        )
+        create_collections(
+            data=types["product.collection"], placeholder_dir=placeholder_dir
+        )
+        create_collection_channel_listings(
+            collection_channel_listings_data=types["product.collectionchannellisting"],
+        )
+        assign_products_to_collections(associations=types["product.collectionproduct"])
 
     all_products_qs = Product.objects.all()
     update_products_search_vector(all_products_qs.values_list("id", flat=True))
@@ -495,9 +550,6 @@ def get_email(first_name, last_name):
 
 def create_product_image(product, placeholder_dir, image_name):
     image = get_image(placeholder_dir, image_name)
-    # We don't want to create duplicated product images
-    if product.media.count() >= len(IMAGES_MAPPING.get(product.pk, [])):
-        return None
     product_image = ProductMedia(product=product, image=image)
     product_image.save()
     return product_image
@@ -1,4 +1,3 @@
-from dataclasses import asdict
 from decimal import Decimal
 
 import graphene
@@ -270,9 +269,10 @@ class ProductChannelListing(ModelObjectType[models.ProductChannelListing]):
                             )
                             from .products import ProductPricingInfo
 
-                            pricing_info = asdict(availability)
-                            pricing_info["display_gross_prices"] = display_gross_prices
-                            return ProductPricingInfo(**pricing_info)
+                            return ProductPricingInfo(
+                                **vars(availability),
+                                display_gross_prices=display_gross_prices,
+                            )
 
                         country_rates = (
                             TaxClassCountryRateByTaxClassIDLoader(context).load(
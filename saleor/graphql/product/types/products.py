@@ -1,6 +1,5 @@
 import sys
 from collections import defaultdict
-from dataclasses import asdict
 from decimal import Decimal
 
 import graphene
@@ -724,7 +723,7 @@ class ProductVariant(ChannelContextType[models.ProductVariant]):
                             tax_rate=tax_rate,
                         )
                         return (
-                            VariantPricingInfo(**asdict(availability))
+                            VariantPricingInfo(**vars(availability))
                             if availability
                             else None
                         )
@@ -1268,9 +1267,10 @@ class Product(ChannelContextType[models.Product]):
                             tax_rate=tax_rate,
                         )
 
-                        pricing_info = asdict(availability)
-                        pricing_info["display_gross_prices"] = display_gross_prices
-                        return ProductPricingInfo(**pricing_info)
+                        return ProductPricingInfo(
+                            **vars(availability),
+                            display_gross_prices=display_gross_prices,
+                        )
 
                     country_rates = (
                         TaxClassCountryRateByTaxClassIDLoader(context).load(
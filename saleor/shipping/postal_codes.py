@@ -3,12 +3,15 @@ from typing import Any
 
 from . import PostalCodeRuleInclusionType
 
+UK_POSTAL_CODE_PATTERN = re.compile(r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$")
+IRISH_POSTAL_CODE_PATTERN = re.compile(r"([\dA-Z]{3}) ?([\dA-Z]{4})")
+
 
 def group_values(pattern, *values):
     result: list[tuple[Any, ...] | None] = []
     for value in values:
         try:
-            val = re.match(pattern, value)
+            val = pattern.match(value)
         except TypeError:
             result.append(None)
         else:
@@ -47,8 +50,7 @@ def check_uk_postal_code(code, start, end):
 
     Example postal codes: BH20 2BC  (UK), IM16 7HF  (Isle of Man).
     """
-    pattern = r"^([A-Z]{1,2})([0-9]+)([A-Z]?) ?([0-9][A-Z]{2})$"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(UK_POSTAL_CODE_PATTERN, code, start, end)
     # replace second item of each tuple with it's value casted to int
     code, start, end = cast_tuple_index_to_type(1, int, code, start, end)
     return compare_values(code, start, end)
@@ -59,8 +61,7 @@ def check_irish_postal_code(code, start, end):
 
     Example postal codes: A65 2F0A, A61 2F0G.
     """
-    pattern = r"([\dA-Z]{3}) ?([\dA-Z]{4})"
-    code, start, end = group_values(pattern, code, start, end)
+    code, start, end = group_values(IRISH_POSTAL_CODE_PATTERN, code, start, end)
     return compare_values(code, start, end)
 
 
@@ -9,7 +9,7 @@ from redis import ConnectionPool
 
 from ....graphql.api import schema
 from ..buffers import RedisBuffer
-from ..utils import GraphQLOperationResponse, get_buffer_name
+from ..utils import WEBHOOKS_KEY, GraphQLOperationResponse, get_buffer_name
 
 backend = get_default_backend()
 
@@ -42,7 +42,7 @@ def gql_operation_factory():
 @pytest.fixture
 def _clear_cache():
     yield
-    cache.clear()
+    cache.delete(WEBHOOKS_KEY)
 
 
 @pytest.fixture